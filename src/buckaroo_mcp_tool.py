@@ -1,42 +1,100 @@
 """Buckaroo MCP tool — lets Claude Code view tabular data files."""
 
 import atexit
+import http.client
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import secrets
+import select
 import signal
 import subprocess
 import sys
+import threading
 import time
-import traceback
-import uuid
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+from operator import itemgetter
 
 from mcp.server.fastmcp import FastMCP
 
+from buckaroo_parent_watch import watch_parent
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON
+    orjson = None
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("ascii")
+
+    _json_loads = json.loads
+
 LOG_DIR = os.path.join(os.path.expanduser("~"), ".buckaroo", "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, "mcp_tool.log")
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(message)s",
+# Log calls only enqueue; a listener thread does the file I/O so request
+# handling never blocks on disk.  SimpleQueue.put is reentrant, so logging
+# from _signal_handler can't deadlock against an interrupted log call.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_file_handler = logging.FileHandler(LOG_FILE)
+_log_file_handler.setFormatter(logging.Formatter(
+    "%(asctime)s [%(levelname)s] %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
+))
+_log_listener: logging.handlers.QueueListener | None = logging.handlers.QueueListener(
+    _log_queue, _log_file_handler,
 )
+_log_listener.start()
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_level = getattr(logging, os.environ.get("BUCKAROO_LOG_LEVEL", "INFO").upper(), None)
+logging.getLogger().setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
 log = logging.getLogger("buckaroo.mcp_tool")
 
+
+def _stop_log_listener():
+    """Flush queued log records to disk.  Safe to call more than once."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+# Registered before _cleanup_server, so it runs after it and keeps its logs
+atexit.register(_stop_log_listener)
+
 SERVER_PORT = int(os.environ.get("BUCKAROO_PORT", "8700"))
 SERVER_URL = f"http://localhost:{SERVER_PORT}"
-SESSION_ID = uuid.uuid4().hex[:12]
+SESSION_ID = secrets.token_hex(6)
+SESSION_URL = f"{SERVER_URL}/s/{SESSION_ID}"
+STARTUP_TIMEOUT_S = 15.0
+
+_LOAD_HEADERS = {"Content-Type": "application/json"}
 
 log.info("MCP tool starting — server=%s session=%s", SERVER_URL, SESSION_ID)
 
+# One keep-alive connection to the data server, shared by all requests.
+# Avoids a TCP connect per call, which adds up in the startup probe loop.
+_conn = http.client.HTTPConnection("localhost", SERVER_PORT, timeout=2)
+_conn_lock = threading.Lock()
+
 # Track server subprocess so we can kill it on exit
 _server_proc: subprocess.Popen | None = None
+# Windows-only watchdog, see _start_server_monitor
 _server_monitor: subprocess.Popen | None = None
 
+# On POSIX the server is started through this launcher, which watches our
+# pid from a thread inside the server and SIGTERMs it when we exit —
+# including SIGKILL or os._exit().  Run by path rather than ``-m`` since
+# this directory isn't on sys.path when the tool runs as a plain script.
+_PARENT_WATCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    "buckaroo_parent_watch.py")
+
 
 def _start_server_monitor(server_pid: int):
     """Spawn a tiny watchdog process that kills the server if we die.
@@ -44,6 +102,12 @@ def _start_server_monitor(server_pid: int):
     The monitor blocks on a pipe from us.  When we exit — for ANY reason,
     including SIGKILL or os._exit() — the OS closes the pipe and the
     monitor wakes up and sends SIGTERM to the server.
+
+    Runs an isolated interpreter without ``site`` (``-I -S``): the monitor
+    only needs builtins, so skip site-packages/.pth processing at startup.
+
+    Only needed on Windows; on POSIX the server watches us itself
+    (see ``buckaroo_parent_watch``).
     """
     global _server_monitor
     monitor_code = (
@@ -56,7 +120,7 @@ def _start_server_monitor(server_pid: int):
         "    pass\n"
     )
     _server_monitor = subprocess.Popen(
-        [sys.executable, "-c", monitor_code],
+        [sys.executable, "-I", "-S", "-c", monitor_code],
         stdin=subprocess.PIPE,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
@@ -97,6 +161,7 @@ def _signal_handler(signum, frame):
     """Handle SIGTERM/SIGINT by cleaning up the server, then re-raising."""
     log.info("Received signal %s — cleaning up", signal.Signals(signum).name)
     _cleanup_server()
+    _stop_log_listener()
     # Re-raise with default handler so the process actually exits
     signal.signal(signum, signal.SIG_DFL)
     os.kill(os.getpid(), signum)
@@ -139,15 +204,42 @@ def view(path: str) -> str:
     return f"Use the view_data tool to load and display the file at {path}"
 
 
-def _health_check() -> dict | None:
+def _request(method: str, path: str, body: bytes | None = None,
+             headers: dict | None = None, timeout: float = 2) -> tuple[int, bytes]:
+    """Send a request to the data server over the shared connection.
+
+    Returns ``(status, body)``.  If a reused connection turns out to be
+    stale (server closed it or was restarted) it reconnects and retries once.
+    """
+    def _send() -> tuple[int, bytes]:
+        try:
+            _conn.request(method, path, body=body, headers=headers or {})
+            resp = _conn.getresponse()
+            return resp.status, resp.read()
+        except (http.client.HTTPException, OSError):
+            _conn.close()
+            raise
+
+    with _conn_lock:
+        _conn.timeout = timeout
+        if _conn.sock is not None:
+            _conn.sock.settimeout(timeout)
+            try:
+                return _send()
+            except (http.client.HTTPException, ConnectionResetError, BrokenPipeError) as exc:
+                log.debug("Stale connection on %s %s (%s) — reconnecting", method, path, exc)
+        return _send()
+
+
+def _health_check(timeout: float = 2) -> dict | None:
     """Returns the health response dict, or None if the server isn't reachable."""
     try:
-        resp = urlopen(f"{SERVER_URL}/health", timeout=2)
-        if resp.status == 200:
-            data = json.loads(resp.read())
+        status, body = _request("GET", "/health", timeout=timeout)
+        if status == 200:
+            data = _json_loads(body)
             log.debug("Health check OK: %s", data)
             return data
-    except (URLError, OSError) as exc:
+    except (http.client.HTTPException, OSError) as exc:
         log.debug("Health check failed: %s", exc)
     return None
 
@@ -155,22 +247,35 @@ def _health_check() -> dict | None:
 def _get_diagnostics() -> dict | None:
     """Fetch /diagnostics from the running server."""
     try:
-        resp = urlopen(f"{SERVER_URL}/diagnostics", timeout=5)
-        if resp.status == 200:
-            return json.loads(resp.read())
-    except (URLError, OSError):
+        status, body = _request("GET", "/diagnostics", timeout=5)
+        if status == 200:
+            return _json_loads(body)
+    except (http.client.HTTPException, OSError):
         pass
     return None
 
 
 def _read_server_log_tail(n_lines: int = 30) -> str:
-    """Read the last N lines of the server log for diagnostics."""
+    """Read the last N lines of the server log for diagnostics.
+
+    Reads backwards from the end of the file (8KB, doubling up to 1MB)
+    rather than loading a possibly huge log into memory.
+    """
     server_log = os.path.join(LOG_DIR, "server.log")
     try:
         if os.path.isfile(server_log):
-            with open(server_log) as f:
-                lines = f.readlines()
-            return "".join(lines[-n_lines:])
+            with open(server_log, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                window = 8192
+                while True:
+                    start = max(0, size - window)
+                    f.seek(start)
+                    lines = f.read().splitlines(keepends=True)
+                    # The first line may be cut off unless we read from the start
+                    if start == 0 or len(lines) > n_lines or window >= 1 << 20:
+                        break
+                    window *= 2
+            return b"".join(lines[-n_lines:]).decode(errors="replace")
     except OSError:
         pass
     return "(server log not found)"
@@ -200,6 +305,36 @@ def _format_startup_failure() -> str:
     )
 
 
+def _open_pidfd(pid: int) -> int | None:
+    """Open a pidfd for *pid* (Linux 5.3+), or None if unsupported.
+
+    The fd becomes readable when the process exits.
+    """
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError as exc:
+        log.debug("pidfd_open(%d) failed: %s", pid, exc)
+        return None
+
+
+_expected_version: str | None = None
+
+
+def _get_expected_version() -> str:
+    """Version of the installed buckaroo package.
+
+    ``import buckaroo`` pulls in pandas/numpy, so do it at most once per
+    process and only when there's a running server to compare against.
+    """
+    global _expected_version
+    if _expected_version is None:
+        import buckaroo
+        _expected_version = getattr(buckaroo, "__version__", "unknown")
+    return _expected_version
+
+
 def ensure_server() -> dict:
     """Start the Buckaroo data server if it isn't already running.
 
@@ -208,12 +343,10 @@ def ensure_server() -> dict:
       - server_pid: int
       - server_uptime_s: float
     """
-    import buckaroo
-    expected_version = getattr(buckaroo, "__version__", "unknown")
-
     health = _health_check()
     if health:
         running_version = health.get("version", "unknown")
+        expected_version = _get_expected_version()
         if running_version == expected_version:
             log.info("Server already running (v%s) — pid=%s uptime=%.0fs",
                      running_version, health.get("pid"), health.get("uptime_s", 0))
@@ -227,45 +360,79 @@ def ensure_server() -> dict:
             log.info("Version mismatch: running=%s expected=%s — killing old server (pid=%s)",
                      running_version, expected_version, old_pid)
             if old_pid:
+                # No need for a graceful shutdown of a stale server.  Windows
+                # has no SIGKILL; there SIGTERM is already TerminateProcess.
                 try:
-                    os.kill(old_pid, signal.SIGTERM)
-                    time.sleep(1)
-                    # Verify it's gone; SIGKILL if not
-                    if _health_check():
-                        os.kill(old_pid, signal.SIGKILL)
-                        time.sleep(0.5)
+                    os.kill(old_pid, getattr(signal, "SIGKILL", signal.SIGTERM))
                 except OSError as exc:
                     log.debug("Kill old server error (harmless): %s", exc)
+                for delay in (0.01, 0.02, 0.05, 0.1, 0.2):
+                    time.sleep(delay)
+                    if not _health_check(timeout=0.25):
+                        break
 
     global _server_proc
-    cmd = [sys.executable, "-m", "buckaroo.server", "--no-browser"]
+    server_args = ["--no-browser", "--port", str(SERVER_PORT)]
+    if os.name == "posix":
+        cmd = [sys.executable, _PARENT_WATCH_SCRIPT, str(os.getpid()),
+               "buckaroo.server", *server_args]
+    else:
+        cmd = [sys.executable, "-m", "buckaroo.server", *server_args]
     log.info("Starting server: %s", " ".join(cmd))
 
     server_log = os.path.join(LOG_DIR, "server.log")
-    server_log_fh = open(server_log, "a")
-    _server_proc = subprocess.Popen(cmd, stdout=server_log_fh, stderr=server_log_fh)
-    _start_server_monitor(_server_proc.pid)
-
-    for i in range(20):
-        time.sleep(0.25)
-        health = _health_check()
-        if health:
-            log.info("Server ready after %.1fs — pid=%s", (i + 1) * 0.25, health.get("pid"))
-            # Check static files on first start
-            static_files = health.get("static_files", {})
-            missing = [
-                name for name, info in static_files.items()
-                if not info.get("exists") or info.get("size_bytes", 0) == 0
-            ]
-            if missing:
-                log.warning("Static files missing or empty: %s — pages may be blank", missing)
-            return {
-                "server_status": "started",
-                "server_pid": health.get("pid"),
-                "server_uptime_s": health.get("uptime_s", 0),
-            }
-
-    log.error("Server failed to start within 5s — see %s", server_log)
+    # The child gets its own copy of the fd; don't keep ours open.
+    with open(server_log, "ab", buffering=0) as server_log_fh:
+        _server_proc = subprocess.Popen(cmd, stdout=server_log_fh, stderr=server_log_fh)
+    if os.name != "posix":
+        _start_server_monitor(_server_proc.pid)
+
+    # Probe right away, then back off.  The server is on localhost so the
+    # sleep — not the HTTP round-trip — dominates startup latency.  Where
+    # available, wait on a pidfd so a crash during startup wakes us at once.
+    t0 = time.monotonic()
+    deadline = t0 + STARTUP_TIMEOUT_S
+    delay = 0.01
+    pidfd = _open_pidfd(_server_proc.pid)
+    try:
+        while True:
+            health = _health_check(timeout=0.25)
+            if health:
+                log.info("Server ready after %.3fs — pid=%s",
+                         time.monotonic() - t0, health.get("pid"))
+                # Check static files on first start
+                static_files = health.get("static_files", {})
+                missing = [
+                    name for name, info in static_files.items()
+                    if not info.get("exists") or info.get("size_bytes", 0) == 0
+                ]
+                if missing:
+                    log.warning("Static files missing or empty: %s — pages may be blank", missing)
+                return {
+                    "server_status": "started",
+                    "server_pid": health.get("pid"),
+                    "server_uptime_s": health.get("uptime_s", 0),
+                }
+            if _server_proc.poll() is not None:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if pidfd is not None:
+                select.select([pidfd], [], [], min(delay, remaining))
+            else:
+                time.sleep(min(delay, remaining))
+            delay = min(0.5, delay * 1.6)
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+    returncode = _server_proc.poll()
+    if returncode is not None:
+        log.error("Server exited during startup (code=%d) after %.3fs — see %s",
+                  returncode, time.monotonic() - t0, server_log)
+    else:
+        log.error("Server failed to start within %.0fs — see %s", STARTUP_TIMEOUT_S, server_log)
     raise RuntimeError(_format_startup_failure())
 
 
@@ -277,39 +444,38 @@ def _view_impl(path: str) -> str:
     try:
         server_info = ensure_server()
     except Exception:
-        log.error("ensure_server failed:\n%s", traceback.format_exc())
+        log.exception("ensure_server failed")
         raise
 
-    payload = json.dumps({"session": SESSION_ID, "path": path, "mode": "buckaroo"}).encode()
-    log.debug("POST %s/load payload=%s", SERVER_URL, payload.decode())
+    payload = _json_dumps({"session": SESSION_ID, "path": path, "mode": "buckaroo"})
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("POST %s/load payload=%s", SERVER_URL, payload.decode())
 
     try:
-        req = Request(
-            f"{SERVER_URL}/load",
-            data=payload,
-            headers={"Content-Type": "application/json"},
+        status, body = _request(
+            "POST", "/load",
+            body=payload,
+            headers=_LOAD_HEADERS,
+            timeout=30,
         )
-        resp = urlopen(req, timeout=30)
-        body = resp.read()
-        log.debug("Response status=%d body=%s", resp.status, body[:500])
     except Exception as exc:
-        # Try to read the response body for HTTP errors
-        err_body = ""
-        if hasattr(exc, "read"):
-            try:
-                err_body = exc.read().decode(errors="replace")
-            except Exception:
-                pass
-        log.error("HTTP request to /load failed: %s body=%s\n%s", exc, err_body, traceback.format_exc())
+        log.error("HTTP request to /load failed: %s", exc, exc_info=True)
         raise
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Response status=%d body=%s", status, body[:500])
+    if status != 200:
+        err_body = body.decode(errors="replace")
+        log.error("HTTP request to /load failed: status=%d body=%s", status, err_body)
+        raise RuntimeError(f"/load failed with HTTP {status}: {err_body}")
 
-    result = json.loads(body)
+    result = _json_loads(body)
 
     rows = result["rows"]
     cols = result["columns"]
-    col_lines = "\n".join(f"  - {c['name']} ({c['dtype']})" for c in cols)
+    col_lines = "\n".join(
+        f"  - {name} ({dtype})" for name, dtype in map(itemgetter("name", "dtype"), cols)
+    )
 
-    url = f"{SERVER_URL}/s/{SESSION_ID}"
     browser_action = result.get("browser_action", "unknown")
     server_pid = result.get("server_pid", server_info.get("server_pid", "?"))
 
@@ -317,7 +483,7 @@ def _view_impl(path: str) -> str:
         f"Loaded **{os.path.basename(path)}** — "
         f"{rows:,} rows, {len(cols)} columns\n\n"
         f"Columns:\n{col_lines}\n\n"
-        f"Interactive view: {url}\n"
+        f"Interactive view: {SESSION_URL}\n"
         f"Server: pid={server_pid} ({server_info['server_status']}) | "
         f"Browser: {browser_action} | Session: {SESSION_ID}"
     )
@@ -372,20 +538,20 @@ def buckaroo_diagnostics() -> str:
             f"Health: {json.dumps(health, indent=2)}"
         )
 
-    # Format static file warnings
+    # Format static file summary and warnings in one pass
     static_files = diag.get("static_files", {})
+    static_lines = []
     warnings = []
     for name, info in static_files.items():
-        if not info.get("exists"):
+        exists = info.get("exists")
+        size = info.get("size_bytes", 0)
+        ok = exists and size > 0
+        static_lines.append(f"  {name}: {'OK' if ok else 'PROBLEM'} ({size:,} bytes)")
+        if not exists:
             warnings.append(f"  MISSING: {name}")
-        elif info.get("size_bytes", 0) == 0:
+        elif size == 0:
             warnings.append(f"  EMPTY: {name} (0 bytes — will cause blank page)")
-
-    static_summary = "\n".join(
-        f"  {name}: {'OK' if info.get('exists') and info.get('size_bytes', 0) > 0 else 'PROBLEM'} "
-        f"({info.get('size_bytes', 0):,} bytes)"
-        for name, info in static_files.items()
-    )
+    static_summary = "\n".join(static_lines)
 
     deps = diag.get("dependencies", {})
     dep_lines = "\n".join(
@@ -418,25 +584,24 @@ def _start_parent_watcher():
 
     When this MCP tool is run via ``uvx``, there is an intermediate ``uv``
     process between Claude and us.  If Claude kills ``uv`` (SIGKILL), we
-    become an orphan (reparented to PID 1 / launchd).  Detect that and
-    exit so the pipe-based server monitor can fire.
-    """
-    import threading
+    become an orphan (reparented to PID 1 / launchd).  Detect that,
+    clean up the server and exit.
 
+    A daemon thread waits in ``buckaroo_parent_watch.wait_for_parent_exit``
+    — on a pidfd (Linux) or kqueue (macOS/BSD), so no polling where the OS
+    allows it.  Unlike ``PR_SET_PDEATHSIG``, this tracks the parent process
+    rather than whichever of its threads happened to spawn us.
+    """
     original_ppid = os.getppid()
     log.info("Parent watcher: original ppid=%d", original_ppid)
 
-    def _watcher():
-        while True:
-            time.sleep(1)
-            current_ppid = os.getppid()
-            if current_ppid != original_ppid:
-                log.info("Parent changed %d → %d — cleaning up", original_ppid, current_ppid)
-                _cleanup_server()
-                os._exit(0)
-
-    t = threading.Thread(target=_watcher, daemon=True)
-    t.start()
+    def _parent_gone():
+        log.info("Parent %d exited — cleaning up", original_ppid)
+        _cleanup_server()
+        _stop_log_listener()
+        os._exit(0)
+
+    watch_parent(original_ppid, _parent_gone)
 
 
 def main():
@@ -0,0 +1,77 @@
+"""Notice when our parent process exits — without polling where the OS allows.
+
+Used in-process by ``buckaroo_mcp_tool``, and as a launcher that ties a
+module's lifetime to its parent::
+
+    python buckaroo_parent_watch.py <parent_pid> <module> [args...]
+
+runs *module* as ``__main__`` and SIGTERMs it once *parent_pid* exits, even
+if the parent was SIGKILLed.  The MCP tool starts ``buckaroo.server`` this
+way so the server never outlives it.
+"""
+
+import os
+import runpy
+import select
+import signal
+import sys
+import threading
+import time
+
+
+def wait_for_parent_exit(parent_pid: int) -> None:
+    """Block until *parent_pid* — our parent process — exits.
+
+    Waits on a kqueue ``NOTE_EXIT`` event on macOS/BSD and on a pidfd on
+    Linux 5.3+.  Elsewhere (Windows, older kernels) polls ``getppid()``
+    once a second.
+    """
+    try:
+        if hasattr(select, "kqueue"):
+            kq = select.kqueue()
+            try:
+                ev = select.kevent(
+                    parent_pid,
+                    filter=select.KQ_FILTER_PROC,
+                    flags=select.KQ_EV_ADD | select.KQ_EV_ENABLE,
+                    fflags=select.KQ_NOTE_EXIT,
+                )
+                kq.control([ev], 1, None)
+            finally:
+                kq.close()
+            return
+        if hasattr(os, "pidfd_open"):
+            fd = os.pidfd_open(parent_pid)
+            try:
+                select.select([fd], [], [])
+            finally:
+                os.close(fd)
+            return
+    except ProcessLookupError:
+        return  # already gone
+    except OSError:
+        pass  # e.g. pidfd_open on Linux < 5.3
+    while os.getppid() == parent_pid:
+        time.sleep(1)
+
+
+def watch_parent(parent_pid: int, on_exit) -> threading.Thread:
+    """Call *on_exit* from a daemon thread once *parent_pid* exits."""
+    def _watch():
+        wait_for_parent_exit(parent_pid)
+        on_exit()
+
+    t = threading.Thread(target=_watch, name="parent-watch", daemon=True)
+    t.start()
+    return t
+
+
+def main(argv: list[str]):
+    parent_pid, module, args = int(argv[0]), argv[1], argv[2:]
+    watch_parent(parent_pid, lambda: os.kill(os.getpid(), signal.SIGTERM))
+    sys.argv = [module, *args]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
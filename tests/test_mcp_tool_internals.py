@@ -0,0 +1,185 @@
+"""Unit tests for buckaroo_mcp_tool helpers — run in-process against a fake server."""
+
+import http.client
+import http.server
+import importlib
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def tool(tmp_path_factory):
+    """Import the tool in-process, then undo its process-wide setup.
+
+    Importing installs SIGTERM/SIGINT handlers, logs to ~/.buckaroo/logs
+    through a QueueListener thread, and sets up the root logger.  Point HOME
+    at a temp dir for the import and restore pytest's own state afterwards.
+    """
+    root = logging.getLogger()
+    saved_level, saved_handlers = root.level, list(root.handlers)
+    saved_signals = {s: signal.getsignal(s) for s in (signal.SIGTERM, signal.SIGINT)}
+    home = str(tmp_path_factory.mktemp("home"))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HOME", home)
+        mp.setenv("USERPROFILE", home)  # expanduser() on Windows
+        mp.syspath_prepend(os.path.join(_REPO_ROOT, "src"))
+        try:
+            module = importlib.import_module("buckaroo_mcp_tool")
+        finally:
+            for sig, handler in saved_signals.items():
+                signal.signal(sig, handler)
+    try:
+        yield module
+    finally:
+        for handler in root.handlers[:]:
+            if handler not in saved_handlers:
+                root.removeHandler(handler)
+        root.setLevel(saved_level)
+        module._stop_log_listener()
+        module._log_file_handler.close()
+        sys.modules.pop("buckaroo_mcp_tool", None)
+
+
+class _FakeServer(http.server.ThreadingHTTPServer):
+    """Counts requests and connections; optionally drops every connection
+    after one response without sending ``Connection: close``."""
+
+    daemon_threads = True
+
+    def __init__(self, drop_connections: bool = False):
+        self.drop_connections = drop_connections
+        self.requests = 0
+        self.connections = 0
+        super().__init__(("127.0.0.1", 0), _FakeHandler)
+
+
+class _FakeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _send(self, status: int, obj: dict):
+        self.server.requests += 1
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def do_GET(self):
+        self._send(200, {"status": "ok", "path": self.path})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._send(400, {"error": "file not found"})
+
+    def log_message(self, *args):
+        pass  # suppress request logs
+
+
+def _serve(tool, monkeypatch, drop_connections=False):
+    httpd = _FakeServer(drop_connections)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=2)
+    monkeypatch.setattr(tool, "_conn", conn)
+    return httpd
+
+
+@pytest.fixture
+def fake_server(tool, monkeypatch):
+    httpd = _serve(tool, monkeypatch)
+    yield httpd
+    httpd.shutdown()
+    tool._conn.close()
+
+
+@pytest.fixture
+def dropping_server(tool, monkeypatch):
+    httpd = _serve(tool, monkeypatch, drop_connections=True)
+    yield httpd
+    httpd.shutdown()
+    tool._conn.close()
+
+
+def test_request_reuses_connection(tool, fake_server):
+    """Consecutive requests share one keep-alive TCP connection."""
+    for _ in range(3):
+        status, body = tool._request("GET", "/health")
+        assert status == 200
+        assert json.loads(body)["path"] == "/health"
+    assert fake_server.requests == 3
+    assert fake_server.connections == 1
+
+
+def test_request_retries_on_stale_connection(tool, dropping_server):
+    """A connection the server silently closed is reopened and the request retried."""
+    for _ in range(3):
+        status, _ = tool._request("GET", "/health")
+        assert status == 200
+    assert dropping_server.requests == 3
+    assert dropping_server.connections == 3
+
+
+def test_request_does_not_retry_fresh_connection_failure(tool, monkeypatch):
+    """Connection refused on a fresh connection surfaces immediately."""
+    with http.server.HTTPServer(("127.0.0.1", 0), _FakeHandler) as httpd:
+        port = httpd.server_address[1]  # closed again when the block exits
+    monkeypatch.setattr(tool, "_conn", http.client.HTTPConnection("127.0.0.1", port, timeout=2))
+    with pytest.raises(ConnectionRefusedError):
+        tool._request("GET", "/health")
+    assert tool._health_check() is None
+
+
+def test_view_impl_raises_with_body_on_http_error(tool, fake_server, monkeypatch, tmp_path):
+    """A non-200 /load response raises RuntimeError carrying the server's message."""
+    monkeypatch.setattr(tool, "ensure_server", lambda: {
+        "server_status": "reused", "server_pid": 1, "server_uptime_s": 0,
+    })
+    with pytest.raises(RuntimeError, match="HTTP 400.*file not found"):
+        tool._view_impl(str(tmp_path / "missing.csv"))
+
+
+def _write_server_log(tool, monkeypatch, tmp_path, data: bytes):
+    monkeypatch.setattr(tool, "LOG_DIR", str(tmp_path))
+    (tmp_path / "server.log").write_bytes(data)
+
+
+def test_log_tail_missing_file(tool, monkeypatch, tmp_path):
+    monkeypatch.setattr(tool, "LOG_DIR", str(tmp_path))
+    assert tool._read_server_log_tail(5) == "(server log not found)"
+
+
+def test_log_tail_shorter_than_window(tool, monkeypatch, tmp_path):
+    _write_server_log(tool, monkeypatch, tmp_path, b"".join(b"line %d\n" % i for i in range(3)))
+    assert tool._read_server_log_tail(5) == "line 0\nline 1\nline 2\n"
+
+
+def test_log_tail_longer_than_window(tool, monkeypatch, tmp_path):
+    """Lines long enough that 8KB holds fewer than N of them widen the window."""
+    lines = [b"%04d " % i + b"x" * 995 + b"\n" for i in range(100)]
+    _write_server_log(tool, monkeypatch, tmp_path, b"".join(lines))
+    assert tool._read_server_log_tail(20) == b"".join(lines[-20:]).decode()
+
+
+def test_log_tail_without_trailing_newline(tool, monkeypatch, tmp_path):
+    data = b"".join(b"line %d\n" % i for i in range(10000)) + b"partial"
+    _write_server_log(tool, monkeypatch, tmp_path, data)
+    assert tool._read_server_log_tail(3) == "line 9998\nline 9999\npartial"
+
+
+def test_log_tail_replaces_undecodable_bytes(tool, monkeypatch, tmp_path):
+    _write_server_log(tool, monkeypatch, tmp_path, b"ok\nbad \xff byte\n")
+    assert tool._read_server_log_tail(1) == "bad \ufffd byte\n"
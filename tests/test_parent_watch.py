@@ -0,0 +1,131 @@
+"""Parent-death tests — the data server must never outlive the MCP tool."""
+
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_REPO_ROOT, "src")
+_WATCH_SCRIPT = os.path.join(_SRC, "buckaroo_parent_watch.py")
+_SERVER_PORT = 8702  # distinct from the other test modules' servers
+
+sys.path.insert(0, _SRC)
+from buckaroo_parent_watch import wait_for_parent_exit  # noqa: E402
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="POSIX parent-watch only")
+
+# Spawns a module through the launcher, prints its pid, then idles until killed.
+_MIDDLE_CODE = """\
+import os, subprocess, sys, time
+w = int(sys.argv[1])
+child = subprocess.Popen(
+    [sys.executable, sys.argv[2], str(os.getpid()), "http.server", "0", "--bind", "127.0.0.1"],
+    pass_fds=(w,),
+)
+print(child.pid, flush=True)
+time.sleep(60)
+"""
+
+
+def test_wait_for_parent_exit_returns_for_dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    start = time.monotonic()
+    wait_for_parent_exit(proc.pid)
+    assert time.monotonic() - start < 2
+
+
+def test_launched_module_dies_when_parent_is_sigkilled():
+    """A module run through the launcher exits once its parent is SIGKILLed.
+
+    The grandchild holds the only other copy of a pipe's write end, so the
+    read end hits EOF exactly when it has exited.
+    """
+    r, w = os.pipe()
+    middle = subprocess.Popen(
+        [sys.executable, "-c", _MIDDLE_CODE, str(w), _WATCH_SCRIPT],
+        pass_fds=(w,),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    os.close(w)
+    try:
+        middle.stdout.readline()  # child pid
+        assert b"Serving HTTP" in middle.stdout.readline()  # child is up
+        middle.kill()
+        middle.wait()
+        ready, _, _ = select.select([r], [], [], 10)
+        assert ready, "launched module still running 10s after its parent died"
+        assert os.read(r, 1) == b""
+    finally:
+        os.close(r)
+        if middle.poll() is None:
+            middle.kill()
+            middle.wait()
+
+
+def _health():
+    try:
+        resp = urlopen(f"http://localhost:{_SERVER_PORT}/health", timeout=1)
+        if resp.status == 200:
+            return json.loads(resp.read())
+    except (URLError, OSError):
+        pass
+    return None
+
+
+def _wait_until_down(tries: int = 40) -> bool:
+    for _ in range(tries):
+        if _health() is None:
+            return True
+        time.sleep(0.25)
+    return False
+
+
+def _kill_test_server():
+    """SIGKILL whatever server answers on the test port, by its /health pid."""
+    health = _health()
+    if health is None:
+        return
+    try:
+        os.kill(health["pid"], signal.SIGKILL)
+    except OSError:
+        pass
+    _wait_until_down()
+
+
+def test_server_dies_when_tool_is_sigkilled():
+    """SIGKILL the MCP tool (no cleanup runs) — the data server must exit too."""
+    code = (
+        f"import sys, time; sys.path.insert(0, {_SRC!r})\n"
+        "import buckaroo_mcp_tool as tool\n"
+        "print(tool.ensure_server()['server_status'], flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    _kill_test_server()  # a leftover server would be "reused", not started
+    tool = subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        env={**os.environ, "BUCKAROO_PORT": str(_SERVER_PORT)},
+    )
+    try:
+        assert tool.stdout.readline().strip() == b"started"
+        assert _health() is not None
+        tool.send_signal(signal.SIGKILL)
+        tool.wait()
+        if not _wait_until_down():
+            pytest.fail("data server still answering 10s after the tool was SIGKILLed")
+    finally:
+        if tool.poll() is None:
+            tool.kill()
+            tool.wait()
+        _kill_test_server()